@@ -6,16 +6,18 @@ Usage (standalone):
 """
 
 import argparse
+import glob
 import os
 import shutil
 import sys
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 
 import pandas as pd
 import requests
 import yfinance as yf
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from tqdm import tqdm
 
 from config import LAST_DATES_PATH, PARQUET_DIR, TICKER_META_PATH
@@ -27,23 +29,28 @@ _HTTP_RETRIES = 3
 PREVI_URL = (
     "https://www.previ-direct.com/web/eclient-suravenir/perf-uc-previ-options"
 )
+_PREVI_ROW_CLASS = "portlet-section-alternate results-row"
 
 
 # ── Scraping ─────────────────────────────────────────────────────────────────
 def _fetch_previ_html() -> bytes:
-    """GET the Previ performance page with exponential-backoff retries."""
-    for attempt in range(_HTTP_RETRIES):
-        try:
-            r = requests.get(PREVI_URL, timeout=_HTTP_TIMEOUT)
-            r.raise_for_status()
-            return r.content
-        except (requests.Timeout, requests.ConnectionError) as exc:
-            if attempt == _HTTP_RETRIES - 1:
-                raise
-            wait = 2**attempt
-            print(f"Previ request failed ({type(exc).__name__}), "
-                  f"retry in {wait}s…", file=sys.stderr)
-            time.sleep(wait)
+    """GET the Previ performance page with exponential-backoff retries.
+
+    Attempts share one Session so a retry can reuse the pooled connection.
+    """
+    with requests.Session() as session:
+        for attempt in range(_HTTP_RETRIES):
+            try:
+                r = session.get(PREVI_URL, timeout=_HTTP_TIMEOUT)
+                r.raise_for_status()
+                return r.content
+            except (requests.Timeout, requests.ConnectionError) as exc:
+                if attempt == _HTTP_RETRIES - 1:
+                    raise
+                wait = 2**attempt
+                print(f"Previ request failed ({type(exc).__name__}), "
+                      f"retry in {wait}s…", file=sys.stderr)
+                time.sleep(wait)
     raise RuntimeError("unreachable")
 
 
@@ -53,13 +60,15 @@ def fetch_tickers() -> pd.DataFrame:
     Filters: EUR-denominated, ≥ 1 year of history. Deduplicates by fund name,
     keeping the ticker with the most quotes.
     """
-    soup = BeautifulSoup(_fetch_previ_html(), "html.parser")
+    # Only build the fund-table rows, not the whole portal page
+    soup = BeautifulSoup(
+        _fetch_previ_html(), "html.parser",
+        parse_only=SoupStrainer("tr", class_=_PREVI_ROW_CLASS),
+    )
 
     units = [
         {"unit_isin": a1.text.strip(), "unit_name": a2.text.strip()}
-        for row in soup.find_all(
-            "tr", class_="portlet-section-alternate results-row"
-        )
+        for row in soup.find_all("tr", class_=_PREVI_ROW_CLASS)
         if len(tds := row.find_all("td")) >= 2
         and (a1 := tds[0].find("a"))
         and (a2 := tds[1].find("a"))
@@ -74,36 +83,43 @@ def fetch_tickers() -> pd.DataFrame:
     def filter_ticker(ticker: str) -> tuple[str, dict] | None:
         try:
             t = yf.Ticker(ticker)
-            info = t.info
-            if info.get("currency") != "EUR":
-                return None
+            # The chart response already carries currency and fund names, so
+            # .info (a separate quoteSummary request) is only a name fallback
             hist = t.history(period="8y")
-            if len(hist) < 252:
+            meta = t.history_metadata or {}
+            if meta.get("currency") != "EUR" or len(hist) < 252:
                 return None
-            name = info.get("longName", info.get("shortName", ""))
+            name = meta.get("longName") or meta.get("shortName")
+            if not name:
+                info = t.info
+                name = info.get("longName", info.get("shortName", ""))
             return ticker, {"name": name.replace('"', ""), "n_quotes": len(hist)}
         except Exception:
             return None
 
-    # Resolve ISINs → candidate tickers (parallel)
-    with ThreadPoolExecutor(MAX_WORKERS) as pool:
-        candidates = {
-            t
-            for ts in tqdm(
-                pool.map(lookup, units), total=len(units),
-                desc="Looking up tickers",
-            )
-            for t in ts
-        }
-    # Validate candidates against yfinance (parallel)
+    # Look up each ISIN and validate its candidates in the same task, so
+    # yfinance checks start while other lookups are still in flight
+    seen: set[str] = set()
+    seen_lock = threading.Lock()
+
+    def resolve(unit: dict[str, str]) -> list[tuple[str, dict] | None]:
+        fresh = []
+        for t in lookup(unit):
+            with seen_lock:
+                if t in seen:
+                    continue
+                seen.add(t)
+            fresh.append(t)
+        return [filter_ticker(t) for t in fresh]
+
     with ThreadPoolExecutor(MAX_WORKERS) as pool:
-        futures = {pool.submit(filter_ticker, t): t for t in candidates}
         results = [
-            f.result()
-            for f in tqdm(
-                as_completed(futures), total=len(futures),
-                desc="Filtering tickers",
+            r
+            for rs in tqdm(
+                pool.map(resolve, units), total=len(units),
+                desc="Resolving tickers",
             )
+            for r in rs
         ]
 
     df = pd.DataFrame.from_dict(
@@ -141,63 +157,71 @@ def _save_last_dates(last_dates: dict[str, object]) -> None:
     )
 
 
-def _to_records(
-    ticker: str, name: str, hist: pd.DataFrame, last_date
-) -> list[tuple]:
-    """Convert yfinance history to flat (date, OHLC, ticker, name) tuples."""
-    hist = hist.reset_index()
-    hist["Date"] = pd.to_datetime(hist["Date"]).dt.tz_localize(None)
-    if last_date is not None:
-        hist = hist[hist["Date"].dt.date > last_date]
-    cols = ["Open", "High", "Low", "Close"]
+_OHLC = {"Open": "open", "High": "high", "Low": "low", "Close": "close"}
+_FRAME_COLUMNS = ["date", "open", "high", "low", "close", "ticker", "name"]
 
-    def _val(row, c):
-        v = getattr(row, c)
-        return None if pd.isna(v) else float(v)
 
-    return [
-        (row.Date.date(), *(_val(row, c) for c in cols), ticker, name)
-        for row in hist.itertuples(index=False)
-    ]
+def _to_frame(
+    ticker: str, name: str, hist: pd.DataFrame, last_date
+) -> pd.DataFrame:
+    """Flatten yfinance history to (date, OHLC, ticker, name) columns."""
+    dates = pd.to_datetime(hist.index).tz_localize(None)
+    if last_date is not None:
+        new = dates.normalize() > pd.Timestamp(last_date)
+        hist, dates = hist[new], dates[new]
+    out = (
+        hist[list(_OHLC)].rename(columns=_OHLC)
+        .astype("float64").reset_index(drop=True)
+    )
+    out.insert(0, "date", dates)
+    out["ticker"] = ticker
+    out["name"] = name
+    return out
 
 
-def _records_to_frame(records: list[tuple]) -> pd.DataFrame:
-    df = pd.DataFrame(
-        records,
-        columns=["date", "open", "high", "low", "close", "ticker", "name"],
-    )
-    if df.empty:
-        return df
+def _concat_frames(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame(columns=_FRAME_COLUMNS)
+    df = pd.concat(frames, ignore_index=True)
     df["ticker"] = df["ticker"].astype(str)
-    df["date"] = pd.to_datetime(df["date"]).dt.date
-    df["year"] = pd.to_datetime(df["date"]).dt.year.astype(int)
+    dates = pd.to_datetime(df["date"])
+    df["date"] = dates.dt.date
+    df["year"] = dates.dt.year.astype(int)
     return df
 
 
 def _download_and_prepare(
     tickers: list[str], tickers_df: pd.DataFrame,
     last_dates: dict, **dl_kwargs,
-) -> list[tuple]:
+) -> list[pd.DataFrame]:
     if not tickers:
         return []
     raw = yf.download(
         tickers, group_by="ticker", auto_adjust=False,
         progress=True, threads=True, **dl_kwargs,
     )
-    records: list[tuple] = []
+    frames: list[pd.DataFrame] = []
     for t in tqdm(tickers, desc="Preparing"):
         try:
             hist = (raw[t] if len(tickers) > 1 else raw).dropna(how="all")
-            records += _to_records(
+            frames.append(_to_frame(
                 t, tickers_df.loc[t, "name"], hist, last_dates.get(t)
-            )
+            ))
         except Exception as exc:
             print(f"  [WARN] {t}: {exc}", file=sys.stderr)
-    return records
+    return frames
 
 
 def _write_parquet_partitioned(df: pd.DataFrame) -> int:
-    """Append new rows as hive-partitioned Parquet files (one per ticker/year)."""
+    """Merge new rows into hive partitions, one Parquet file per ticker/year.
+
+    Touched partitions are rewritten with their existing rows, so incremental
+    runs don't leave a growing pile of small files for every load to open.
+    The merged file is staged under an underscore prefix (ignored by dataset
+    readers) and old parts are removed before it is promoted, so a crash
+    never exposes duplicate rows; a leftover staged file is merged next time.
+    """
     if df.empty:
         return 0
     fact = df.drop(columns=["name"])
@@ -208,9 +232,18 @@ def _write_parquet_partitioned(df: pd.DataFrame) -> int:
             PARQUET_DIR, f"ticker={ticker}", f"year={int(year)}"
         )
         os.makedirs(part_dir, exist_ok=True)
-        g.drop(columns=["ticker", "year"]).to_parquet(
-            os.path.join(part_dir, f"part-{ts}.parquet"), index=False
-        )
+        old_parts = sorted(glob.glob(os.path.join(part_dir, "part-*.parquet")))
+        staged = sorted(glob.glob(os.path.join(part_dir, "_part-*.tmp")))
+        merged = pd.concat(
+            [*(pd.read_parquet(p) for p in old_parts + staged),
+             g.drop(columns=["ticker", "year"])],
+            ignore_index=True,
+        ).drop_duplicates("date", keep="last").sort_values("date")
+        tmp = os.path.join(part_dir, f"_part-{ts}.tmp")
+        merged.to_parquet(tmp, index=False)
+        for p in old_parts + [st for st in staged if st != tmp]:
+            os.remove(p)
+        os.replace(tmp, os.path.join(part_dir, f"part-{ts}.parquet"))
         rows += len(g)
     return rows
 
@@ -222,7 +255,7 @@ def ingest_all(tickers_df: pd.DataFrame, last_dates: dict) -> int:
     existing = [t for t in tickers if t in last_dates]
 
     # New tickers: full history; existing: incremental from last known date
-    records = _download_and_prepare(
+    frames = _download_and_prepare(
         new, tickers_df, {}, period="max"
     ) + _download_and_prepare(
         existing, tickers_df, last_dates,
@@ -230,7 +263,7 @@ def ingest_all(tickers_df: pd.DataFrame, last_dates: dict) -> int:
             str(min(last_dates[t] for t in existing)) if existing else None
         ),
     )
-    df = _records_to_frame(records)
+    df = _concat_frames(frames)
     written = _write_parquet_partitioned(df)
     if written and not df.empty:
         maxes = df.groupby("ticker")["date"].max().to_dict()
@@ -254,7 +287,9 @@ def _save_ticker_meta(tickers_df: pd.DataFrame) -> None:
 
 def _load_ticker_meta() -> pd.DataFrame:
     """Read TICKER_META_PATH back as a ticker-indexed DataFrame."""
-    return pd.read_parquet(TICKER_META_PATH).set_index("ticker")
+    return pd.read_parquet(
+        TICKER_META_PATH, columns=["ticker", "name"]
+    ).set_index("ticker")
 
 
 # ── CLI ──────────────────────────────────────────────────────────────────────
@@ -2,10 +2,20 @@
 
 import os
 
-import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.dataset as pds
 
+# Explicit partition types: tickers stay strings even if they look numeric,
+# and arrive dictionary-encoded so pandas gets a categorical column directly
+_PARTITIONING = pds.HivePartitioning.discover(
+    schema=pa.schema([
+        ("ticker", pa.dictionary(pa.int32(), pa.string())),
+        ("year", pa.int32()),
+    ]),
+)
+
 
 def load_prices_parquet(
     *,
@@ -23,22 +33,37 @@ def load_prices_parquet(
     if not parquet_dir or not os.path.exists(parquet_dir):
         raise FileNotFoundError(f"parquet_dir not found: {parquet_dir!r}")
 
-    dataset = pds.dataset(parquet_dir, format="parquet", partitioning="hive")
-    df = dataset.to_table(columns=["date", "ticker", "close"]).to_pandas()
+    dataset = pds.dataset(
+        parquet_dir, format="parquet", partitioning=_PARTITIONING
+    )
+    # Skip whole year partitions that cannot fall inside the window
+    part_years = [
+        pds.get_partition_keys(f.partition_expression).get("year")
+        for f in dataset.get_fragments()
+    ]
+    part_years = [y for y in part_years if y is not None]
+    row_filter = None
+    if part_years and min(part_years) < max(part_years) - years:
+        row_filter = pc.field("year") >= max(part_years) - years
+    table = dataset.to_table(
+        columns=["date", "ticker", "close"], filter=row_filter
+    )
 
-    if df.empty:
+    if table.num_rows == 0:
         raise RuntimeError(
             f"No data found under parquet_dir={parquet_dir!r}"
         )
 
-    df["date"] = pd.to_datetime(df["date"])
-    df["ticker"] = df["ticker"].astype(str).astype("category")
-    df["close"] = pd.to_numeric(df["close"], errors="coerce").astype(
-        np.float64
-    )
-
-    cutoff = df["date"].max() - pd.DateOffset(years=years)
-    df = df[df["date"] >= cutoff]
+    # Cast and trim to the window in Arrow, so pandas only materialises
+    # typed rows that are kept
+    dates = pc.cast(table["date"], pa.timestamp("s"))
+    cutoff = pd.Timestamp(pc.max(dates).as_py()) - pd.DateOffset(years=years)
+    keep = pc.greater_equal(dates, pa.scalar(cutoff, type=pa.timestamp("s")))
+    df = pa.table({
+        "date": dates,
+        "ticker": table["ticker"],
+        "close": pc.cast(table["close"], pa.float64()),
+    }).filter(keep).to_pandas()
 
     prices = df.pivot(index="date", columns="ticker", values="close")
     prices = prices.sort_index().tail(annual_factor * years)
@@ -47,7 +72,7 @@ def load_prices_parquet(
 
     if ticker_meta_path and os.path.exists(ticker_meta_path):
         ticker_names = pd.read_parquet(
-            ticker_meta_path
+            ticker_meta_path, columns=["ticker", "name"]
         ).set_index("ticker")["name"]
     else:
         ticker_names = pd.Series(dtype=object)
@@ -77,21 +77,201 @@ def format_weights(
     threshold: float = 0.01,
 ) -> str:
     """Human-readable string of non-negligible weights."""
+    weights = np.asarray(weights)
+    keep = np.flatnonzero(weights > threshold)
     return "\n".join(
         f"  {ticker_names.get(t, t)}: {w * 100:.2f}%"
-        for t, w in zip(tickers, weights, strict=False)
-        if w > threshold
+        for t, w in zip(tickers[keep], weights[keep], strict=True)
     )
 
 
+def _annualise(
+    mu: np.ndarray, cov: np.ndarray, annual_factor: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Annualised mu/cov as contiguous float64, hoisted out of the solver loop."""
+    mu_a = np.ascontiguousarray(mu, dtype=np.float64) * annual_factor
+    cov_a = np.ascontiguousarray(cov, dtype=np.float64) * annual_factor
+    return mu_a, cov_a
+
+
 def _optim_setup(n: int, max_weight: float = 1.0):
     """Equal-weight start, long-only bounds, and sum-to-one constraint."""
     x0 = np.ones(n) / n
     bounds = [(0.0, max_weight)] * n
-    constraint = {"type": "eq", "fun": lambda w: w.sum() - 1}
+    constraint = {
+        "type": "eq",
+        "fun": _affine,
+        "jac": _affine_jac,
+        "args": (np.ones(n), 1.0),
+    }
     return x0, bounds, constraint
 
 
+# ── Solver kernels ───────────────────────────────────────────────────────────
+
+
+def _affine(x: np.ndarray, a: np.ndarray, b: float) -> np.ndarray | float:
+    """Linear constraint a·x − b (a 1-D → scalar, a 2-D → one row each)."""
+    return a @ x - b
+
+
+def _affine_jac(x: np.ndarray, a: np.ndarray, b: float) -> np.ndarray:
+    return a
+
+
+def _quad_and_grad(
+    y: np.ndarray, cov_a: np.ndarray
+) -> tuple[float, np.ndarray]:
+    cy = cov_a @ y
+    return float(y @ cy), 2.0 * cy
+
+
+def _neg_return_and_grad(
+    w: np.ndarray, mu_a: np.ndarray
+) -> tuple[float, np.ndarray]:
+    return -float(mu_a @ w), -mu_a
+
+
+def _var_slack(w: np.ndarray, cov_a: np.ndarray, target_var: float) -> float:
+    """target − wᵀΣw, non-negative when the volatility target holds."""
+    return target_var - float(w @ cov_a @ w)
+
+
+def _var_slack_jac(
+    w: np.ndarray, cov_a: np.ndarray, target_var: float
+) -> np.ndarray:
+    return -2.0 * (cov_a @ w)
+
+
+def _with_turnover(
+    value: float, grad: np.ndarray, w: np.ndarray, prev: np.ndarray, lam: float
+) -> tuple[float, np.ndarray]:
+    """Add λ·‖w − prev‖₁ and its subgradient; no-op when λ is zero."""
+    if lam == 0.0:
+        return value, grad
+    diff = w - prev
+    return value + lam * float(np.abs(diff).sum()), grad + lam * np.sign(diff)
+
+
+def _neg_sharpe_and_grad(
+    w: np.ndarray,
+    mu_a: np.ndarray,
+    cov_a: np.ndarray,
+    risk_free: float,
+    prev: np.ndarray,
+    lam: float,
+) -> tuple[float, np.ndarray]:
+    cw = cov_a @ w
+    vol = np.sqrt(max(float(w @ cw), 0.0))
+    excess, denom = float(mu_a @ w) - risk_free, vol + 1e-12
+    # d(Sharpe)/dw = mu/σ − excess·Σw/σ³ (with the 1e-12 guard on σ)
+    grad = excess / (denom * denom * max(vol, 1e-12)) * cw - mu_a / denom
+    return _with_turnover(-excess / denom, grad, w, prev, lam)
+
+
+def _vol_and_grad(
+    w: np.ndarray, cov_a: np.ndarray, prev: np.ndarray, lam: float
+) -> tuple[float, np.ndarray]:
+    cw = cov_a @ w
+    vol = np.sqrt(max(float(w @ cw), 0.0))
+    return _with_turnover(vol, cw / max(vol, 1e-12), w, prev, lam)
+
+
+def _interior_solution(
+    cov_a: np.ndarray, b: np.ndarray, *, max_weight: float
+) -> np.ndarray | None:
+    """Normalised Σ⁻¹b if it already satisfies 0 ≤ w ≤ max_weight, else None.
+
+    With b = μ − rf (tangency) or b = 1 (min variance) this is the optimum on
+    the budget hyperplane; when it is also inside the box it is the
+    constrained optimum, so the iterative solve can be skipped.
+    """
+    try:
+        z = np.linalg.solve(cov_a, b)
+    except np.linalg.LinAlgError:
+        return None
+    total = z.sum()
+    if total <= 0:
+        return None
+    w = z / total
+    if w.min() < 0 or w.max() > max_weight:
+        return None
+    return w
+
+
+def _sharpe_warm_start(
+    mu_a: np.ndarray, cov_a: np.ndarray, *, max_weight: float, risk_free: float
+) -> np.ndarray | None:
+    """Weights ∝ positive per-asset Sharpe, water-filled under *max_weight*."""
+    vol = np.sqrt(np.maximum(np.diag(cov_a), 0.0))
+    score = np.clip((mu_a - risk_free) / np.maximum(vol, 1e-6), 0.0, None)
+    if score.sum() <= 0:
+        return None
+    capped = np.zeros(len(score), dtype=bool)
+    w = score / score.sum()
+    # Cap the largest names and hand their excess to the rest, pro rata
+    while np.any(over := ~capped & (w > max_weight)):
+        capped |= over
+        free = np.where(capped, 0.0, score)
+        rest = 1.0 - max_weight * capped.sum()
+        if free.sum() <= 0:
+            # Every positive-Sharpe name is capped: spread the rest evenly
+            n_free = max(int((~capped).sum()), 1)
+            return np.where(
+                capped, max_weight, min(max(rest, 0.0) / n_free, max_weight)
+            )
+        w = np.where(capped, max_weight, rest * free / free.sum())
+    return w
+
+
+def _max_sharpe_qp(
+    mu_a: np.ndarray, cov_a: np.ndarray, *, max_weight: float, risk_free: float
+) -> np.ndarray | None:
+    """Tangency weights from the convex homogeneous QP (None if not applicable).
+
+    min yᵀΣy  s.t. (μ − rf)ᵀy = 1, y ≥ 0, y_i ≤ max_weight·Σy;  w = y / Σy.
+    Requires at least one asset with positive excess return.
+    """
+    excess = mu_a - risk_free
+    if not np.any(excess > 0):
+        return None
+    n = len(mu_a)
+    # Scale the heuristic start onto the budget hyperplane (μ − rf)ᵀy = 1,
+    # falling back to the best asset if the start has no positive excess
+    w0 = _sharpe_warm_start(
+        mu_a, cov_a, max_weight=max_weight, risk_free=risk_free
+    )
+    if excess @ w0 <= 0:
+        w0 = (excess == excess.max()).astype(np.float64)
+    y0 = w0 / (excess @ w0)
+
+    constraints = [{
+        "type": "eq", "fun": _affine, "jac": _affine_jac, "args": (excess, 1.0),
+    }]
+    if max_weight < 1.0:
+        # y_i ≤ max_weight·Σy as (max_weight·11ᵀ − I)y ≥ 0; SLSQP takes a
+        # dense jacobian anyway, so the constant matrix is built once here
+        cap = max_weight * np.ones((n, n)) - np.eye(n)
+        constraints.append({
+            "type": "ineq", "fun": _affine, "jac": _affine_jac, "args": (cap, 0.0),
+        })
+
+    res = minimize(
+        _quad_and_grad,
+        y0,
+        args=(cov_a,),
+        jac=True,
+        method="SLSQP",
+        bounds=[(0.0, None)] * n,
+        constraints=constraints,
+        options={"ftol": 1e-12},  # objective is ~1/Sharpe², so tighten
+    )
+    total = res.x.sum()
+    if not res.success or total <= 0:
+        return None
+    return res.x / total
+
+
 # ── Optimisation ─────────────────────────────────────────────────────────────
 
 
@@ -106,18 +286,45 @@ def max_sharpe(
     prev_weights: np.ndarray | None = None,
     turnover_penalty: float = 0.0,
 ) -> OptimResult:
-    """Tangency portfolio via SLSQP. Minimises −Sharpe + λ·turnover."""
+    """Tangency portfolio. Minimises −Sharpe + λ·turnover.
+
+    Without a turnover penalty the problem is solved as a convex QP
+    (global optimum); otherwise, or if the QP does not apply, via SLSQP.
+    """
     x0, bounds, eq = _optim_setup(n_assets, max_weight)
     prev = np.zeros(n_assets) if prev_weights is None else prev_weights
     lam = float(turnover_penalty)
+    mu_a, cov_a = _annualise(mu, cov, annual_factor)
 
-    def obj(w: np.ndarray) -> float:
-        sharpe = portfolio_stats(
-            w, mu, cov, annual_factor=annual_factor, risk_free=risk_free
-        )[2]
-        return float(-sharpe + lam * np.abs(w - prev).sum())
-
-    res = minimize(obj, x0, method="SLSQP", constraints=[eq], bounds=bounds)
+    if lam == 0.0:
+        w = _interior_solution(
+            cov_a, mu_a - risk_free, max_weight=max_weight
+        )
+        if w is None:
+            w = _max_sharpe_qp(
+                mu_a, cov_a, max_weight=max_weight, risk_free=risk_free
+            )
+        if w is not None:
+            ret, vol, sharpe = portfolio_stats(
+                w, mu, cov, annual_factor=annual_factor, risk_free=risk_free
+            )
+            return OptimResult(weights=w, ret=ret, vol=vol, sharpe=sharpe)
+
+    w0 = _sharpe_warm_start(
+        mu_a, cov_a, max_weight=max_weight, risk_free=risk_free
+    )
+    if w0 is not None:
+        x0 = w0
+
+    res = minimize(
+        _neg_sharpe_and_grad,
+        x0,
+        args=(mu_a, cov_a, risk_free, prev, lam),
+        jac=True,
+        method="SLSQP",
+        constraints=[eq],
+        bounds=bounds,
+    )
     ret, vol, sharpe = portfolio_stats(
         res.x, mu, cov, annual_factor=annual_factor, risk_free=risk_free
     )
@@ -135,16 +342,33 @@ def min_variance(
     prev_weights: np.ndarray | None = None,
     turnover_penalty: float = 0.0,
 ) -> OptimResult:
-    """Global minimum-variance portfolio (ignores expected returns)."""
+    """Global minimum-variance portfolio (ignores expected returns).
+
+    Closed form when unpenalised and the unconstrained solution is long-only
+    within *max_weight*; otherwise SLSQP.
+    """
     x0, bounds, eq = _optim_setup(n_assets, max_weight)
     prev = np.zeros(n_assets) if prev_weights is None else prev_weights
     lam = float(turnover_penalty)
-
-    def obj(w: np.ndarray) -> float:
-        vol = np.sqrt(w @ cov @ w * annual_factor)
-        return float(vol + lam * np.abs(w - prev).sum())
-
-    res = minimize(obj, x0, method="SLSQP", constraints=[eq], bounds=bounds)
+    _, cov_a = _annualise(mu, cov, annual_factor)
+
+    if lam == 0.0:
+        w = _interior_solution(cov_a, np.ones(n_assets), max_weight=max_weight)
+        if w is not None:
+            ret, vol, sharpe = portfolio_stats(
+                w, mu, cov, annual_factor=annual_factor, risk_free=risk_free
+            )
+            return OptimResult(weights=w, ret=ret, vol=vol, sharpe=sharpe)
+
+    res = minimize(
+        _vol_and_grad,
+        x0,
+        args=(cov_a, prev, lam),
+        jac=True,
+        method="SLSQP",
+        constraints=[eq],
+        bounds=bounds,
+    )
     ret, vol, sharpe = portfolio_stats(
         res.x, mu, cov, annual_factor=annual_factor, risk_free=risk_free
     )
@@ -159,38 +383,45 @@ def efficient_frontier(
     max_weight: float = 1.0,
     annual_factor: int = 252,
     n_points: int = 200,
+    min_var: OptimResult | None = None,
 ) -> tuple[np.ndarray, np.ndarray]:
-    """Sweep target volatilities and maximise return at each level."""
+    """Sweep target volatilities and maximise return at each level.
+
+    Pass *min_var* (solved with the same inputs) to skip re-solving it.
+    """
     x0, bounds, eq = _optim_setup(n_assets, max_weight)
+    mu_a, cov_a = _annualise(mu, cov, annual_factor)
 
-    mv = min_variance(
+    mv = min_var if min_var is not None else min_variance(
         mu, cov, n_assets=n_assets, max_weight=max_weight,
         annual_factor=annual_factor,
     )
     # Upper bound: max individual-asset vol (extends frontier past best-return corner)
-    max_vol = float(
-        np.sqrt(np.maximum(np.diag(cov), 0.0) * annual_factor).max()
-    )
+    max_vol = float(np.sqrt(np.maximum(np.diag(cov_a), 0.0)).max())
 
     pairs: list[tuple[float, float]] = []
     for target_vol in np.linspace(mv.vol, max_vol, n_points):
         tv2 = target_vol**2
         res = minimize(
-            lambda w: -(mu @ w * annual_factor),
+            _neg_return_and_grad,
             x0,
+            args=(mu_a,),
+            jac=True,
             method="SLSQP",
             bounds=bounds,
             constraints=[
                 eq,
                 {
                     "type": "ineq",
-                    "fun": lambda w, t=tv2: t - w @ cov @ w * annual_factor,
+                    "fun": _var_slack,
+                    "jac": _var_slack_jac,
+                    "args": (cov_a, tv2),
                 },
             ],
         )
         if res.success:
-            ret = float(mu @ res.x * annual_factor)
-            vol = float(np.sqrt(res.x @ cov @ res.x * annual_factor))
+            ret = float(mu_a @ res.x)
+            vol = float(np.sqrt(res.x @ cov_a @ res.x))
             pairs.append((vol, ret))
 
     arr = np.array(pairs)
@@ -238,6 +469,9 @@ def walk_forward_backtest(
     """Expanding-window backtest with optional turnover penalty and costs."""
     n_assets = log_returns.shape[1]
     prev_weights = np.zeros(n_assets)
+    # One C-contiguous float64 block; train windows are row-prefix views of it
+    lr = np.ascontiguousarray(log_returns.to_numpy(dtype=np.float64))
+    simple = np.exp(lr) - 1
 
     period_returns: list[pd.Series] = []
     rebal_dates: list[pd.Timestamp] = []
@@ -255,16 +489,18 @@ def walk_forward_backtest(
     for rebal, test_lr in _each_oos_period(
         log_returns, rebal_days, min_train_days,
     ):
-        train_lr = log_returns.iloc[:rebal]
+        train_lr = lr[:rebal]
 
-        mu_wf = train_lr.mean().values
-        cov_wf = LedoitWolf().fit(train_lr.values).covariance_
+        mu_wf = train_lr.mean(axis=0)
+        cov_wf = LedoitWolf().fit(train_lr).covariance_
         weights = solver(
             mu_wf, cov_wf, prev_weights=prev_weights, **opt_kw
         ).weights
 
         # Log → simple returns for P&L, then deduct costs on day 1
-        period_ret = (np.exp(test_lr) - 1) @ weights
+        period_ret = pd.Series(
+            simple[rebal : rebal + len(test_lr)] @ weights, index=test_lr.index
+        )
         turnover = np.abs(weights - prev_weights).sum()
         period_ret.iloc[0] -= transaction_cost * turnover
         prev_weights = weights.copy()
@@ -224,8 +224,7 @@ def _plot_correlation(
     Z = linkage(squareform(dist, checks=False), method="average")
     order = leaves_list(Z)
     corr = corr[np.ix_(order, order)]
-    tickers = cov_df.columns[order]
-    labels = [_display_name(str(t), ticker_names) for t in tickers]
+    n = len(order)
 
     im = ax.imshow(
         corr,
@@ -235,12 +234,15 @@ def _plot_correlation(
         aspect="equal",
         interpolation="nearest",
     )
-    ax.set_xticks(range(len(labels)))
-    ax.set_yticks(range(len(labels)))
+    # Ticks stay for the cell grid; names are only built when drawn
+    ax.set_xticks(range(n))
+    ax.set_yticks(range(n))
     ax.set_xticklabels([])
-    n = len(labels)
     if n <= 25:
-        ax.set_yticklabels(labels, fontsize=8)
+        ax.set_yticklabels(
+            [_display_name(str(t), ticker_names) for t in cov_df.columns[order]],
+            fontsize=8,
+        )
     else:
         ax.set_yticklabels([])
     ax.set_title("Correlation (Ledoit-Wolf, clustered)")
@@ -264,9 +266,10 @@ def _plot_risk_contributions(
     name_list = list(risk_contribs.keys())
     colors = [_COLORS.get("tangency"), _COLORS.get("minvar")]
     rc0, tickers0 = risk_contribs[name_list[0]]
-    order = np.argsort(rc0)[::-1]
-    top = min(15, len(order))
-    idx = order[:top]
+    top = min(15, len(rc0))
+    # Select the largest contributions first, then sort only those
+    idx = np.argpartition(rc0, -top)[-top:]
+    idx = idx[np.argsort(rc0[idx])[::-1]]
 
     y = np.arange(top)
     bar_h = 0.35
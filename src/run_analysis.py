@@ -71,6 +71,7 @@ def main() -> None:
         n_assets=n,
         max_weight=cfg.MAX_WEIGHT,
         annual_factor=cfg.ANNUAL_FACTOR,
+        min_var=min_var,
     )
 
     rc = dict(cov=cov, annual_factor=cfg.ANNUAL_FACTOR)
@@ -0,0 +1,91 @@
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import build_database
+from data import load_prices_parquet
+
+
+def _frame(ticker: str, dates: pd.DatetimeIndex, close: float) -> pd.DataFrame:
+    n = len(dates)
+    df = pd.DataFrame(
+        {
+            "date": dates.date,
+            "open": np.full(n, close),
+            "high": np.full(n, close),
+            "low": np.full(n, close),
+            "close": np.full(n, close),
+            "ticker": ticker,
+            "name": f"Fund {ticker}",
+        }
+    )
+    df["year"] = pd.to_datetime(df["date"]).dt.year.astype(int)
+    return df
+
+
+@pytest.fixture()
+def parquet_dir(tmp_path, monkeypatch) -> str:
+    path = str(tmp_path / "opcvm_parquet")
+    os.makedirs(path)
+    monkeypatch.setattr(build_database, "PARQUET_DIR", path)
+    return path
+
+
+def _parts(parquet_dir: str) -> dict[str, list[str]]:
+    parts: dict[str, list[str]] = {}
+    for f in glob.glob(os.path.join(parquet_dir, "*", "*", "*")):
+        parts.setdefault(os.path.dirname(f), []).append(os.path.basename(f))
+    return parts
+
+
+def test_write_merges_overlap_into_one_file_per_partition(parquet_dir) -> None:
+    first = pd.bdate_range("2023-12-01", "2024-01-31")
+    second = pd.bdate_range("2024-01-15", "2024-02-29")
+    build_database._write_parquet_partitioned(pd.concat([
+        _frame("AAA", first, 1.0), _frame("BBB", first.union(second), 2.0),
+    ]))
+    written = build_database._write_parquet_partitioned(
+        _frame("AAA", second, 5.0)
+    )
+
+    assert written == len(second)
+    parts = _parts(parquet_dir)
+    assert len(parts) == 4  # AAA/BBB × 2023/2024
+    assert all(
+        len(files) == 1 and files[0].startswith("part-")
+        for files in parts.values()
+    )
+
+    prices, _ = load_prices_parquet(
+        parquet_dir=parquet_dir,
+        ticker_meta_path=None,
+        years=1,
+        annual_factor=252,
+        fill_ratio=0.0,
+    )
+    aaa = prices["AAA"].dropna()
+    assert aaa.index.is_unique
+    assert len(aaa) == len(first.union(second))
+    assert (aaa[aaa.index >= second[0]] == 5.0).all()
+    assert (aaa[aaa.index < second[0]] == 1.0).all()
+    assert prices["BBB"].dropna().eq(2.0).all()
+
+
+def test_write_recovers_leftover_staged_file(parquet_dir) -> None:
+    dates = pd.bdate_range("2024-03-01", periods=10)
+    part_dir = os.path.join(parquet_dir, "ticker=AAA", "year=2024")
+    os.makedirs(part_dir)
+    # A crash after removing old parts leaves only the staged merge behind
+    _frame("AAA", dates[:5], 1.0).drop(
+        columns=["ticker", "name", "year"]
+    ).to_parquet(os.path.join(part_dir, "_part-1.tmp"), index=False)
+
+    build_database._write_parquet_partitioned(_frame("AAA", dates[5:], 2.0))
+
+    files = os.listdir(part_dir)
+    assert len(files) == 1 and files[0].startswith("part-")
+    merged = pd.read_parquet(os.path.join(part_dir, files[0]))
+    assert merged["close"].tolist() == [1.0] * 5 + [2.0] * 5
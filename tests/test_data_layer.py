@@ -115,3 +115,60 @@ def test_load_prices_fill_ratio_vs_shorter_history_than_window(tmp_path) -> None
 
     assert list(prices.columns) == ["AAA", "BBB"]
     assert len(prices) == 100
+
+
+def test_load_prices_numeric_looking_tickers_stay_strings(tmp_path) -> None:
+    parquet_dir = tmp_path / "opcvm_parquet"
+    os.makedirs(parquet_dir, exist_ok=True)
+
+    dates = pd.bdate_range("2024-01-01", periods=30)
+    long = pd.DataFrame(
+        {
+            "date": np.tile(dates.date, 2),
+            "ticker": ["0123"] * len(dates) + ["456"] * len(dates),
+            "close": np.concatenate(
+                [100 + np.arange(len(dates)), 200 + np.arange(len(dates))]
+            ).astype(float),
+        }
+    )
+    long["year"] = pd.to_datetime(long["date"]).dt.year.astype(int)
+    _write_partitioned_parquet(str(parquet_dir), long, ts=4)
+
+    prices, _ = load_prices_parquet(
+        years=1,
+        annual_factor=30,
+        fill_ratio=0.9,
+        ticker_meta_path=None,
+        parquet_dir=str(parquet_dir),
+    )
+
+    assert list(prices.columns) == ["0123", "456"]
+
+
+def test_load_prices_window_spans_year_partitions(tmp_path) -> None:
+    parquet_dir = tmp_path / "opcvm_parquet"
+    os.makedirs(parquet_dir, exist_ok=True)
+
+    dates = pd.bdate_range("2019-03-01", "2024-06-28")
+    long = pd.DataFrame(
+        {
+            "date": dates.date,
+            "ticker": "AAA",
+            "close": 100 + np.arange(len(dates), dtype=float),
+        }
+    )
+    long["year"] = pd.to_datetime(long["date"]).dt.year.astype(int)
+    _write_partitioned_parquet(str(parquet_dir), long, ts=5)
+
+    prices, _ = load_prices_parquet(
+        years=2,
+        annual_factor=400,
+        fill_ratio=0.9,
+        ticker_meta_path=None,
+        parquet_dir=str(parquet_dir),
+    )
+
+    expected = dates[dates >= dates[-1] - pd.DateOffset(years=2)]
+    assert prices.index[0] == expected[0]
+    assert prices.index[-1] == dates[-1]
+    assert len(prices) == len(expected)
@@ -6,6 +6,7 @@ All tests use synthetic data — no database required.
 import numpy as np
 import pandas as pd
 import pytest
+from scipy.optimize import minimize
 
 from markowitz import (
     BacktestResult,
@@ -13,6 +14,7 @@ from markowitz import (
     compute_log_returns,
     efficient_frontier,
     equal_weight_backtest,
+    format_weights,
     max_sharpe,
     min_variance,
     portfolio_stats,
@@ -36,6 +38,25 @@ def synthetic_prices() -> pd.DataFrame:
     return pd.DataFrame(prices, index=dates, columns=["A", "B", "C"])
 
 
+@pytest.fixture()
+def interior_mu_cov() -> tuple[np.ndarray, np.ndarray]:
+    """Daily inputs whose unconstrained optima are already long-only."""
+    vols = np.array([0.10, 0.14, 0.12]) / np.sqrt(252)
+    corr = np.array([[1.0, 0.3, 0.2], [0.3, 1.0, 0.25], [0.2, 0.25, 1.0]])
+    return np.array([0.06, 0.08, 0.07]) / 252, corr * np.outer(vols, vols)
+
+
+def _slsqp(obj, n: int) -> np.ndarray:
+    return minimize(
+        obj,
+        np.ones(n) / n,
+        method="SLSQP",
+        bounds=[(0.0, 1.0)] * n,
+        constraints=[{"type": "eq", "fun": lambda w: w.sum() - 1}],
+        options={"ftol": 1e-12},
+    ).x
+
+
 @pytest.fixture()
 def mu_cov(synthetic_prices: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
     lr = compute_log_returns(synthetic_prices)
@@ -66,6 +87,16 @@ class TestPortfolioStats:
         assert np.isfinite(sharpe)
 
 
+class TestFormatWeights:
+    def test_drops_small_weights_and_uses_names(self):
+        out = format_weights(
+            np.array([0.6, 0.005, 0.395]),
+            pd.Index(["A", "B", "C"]),
+            pd.Series({"A": "Fund A"}),
+        )
+        assert out.splitlines() == ["  Fund A: 60.00%", "  C: 39.50%"]
+
+
 class TestMaxSharpe:
     def test_weights_sum_to_one(self, mu_cov):
         mu, cov = mu_cov
@@ -83,6 +114,39 @@ class TestMaxSharpe:
         assert r.vol > 0
         assert np.isfinite(r.sharpe)
 
+    def test_beats_random_feasible_portfolios(self, mu_cov):
+        mu, cov = mu_cov
+        best = max_sharpe(mu, cov, n_assets=3, risk_free=0.0).sharpe
+        rng = np.random.default_rng(0)
+        for w in rng.dirichlet(np.ones(3), size=500):
+            assert portfolio_stats(w, mu, cov, risk_free=0.0)[2] <= best + 1e-6
+
+    def test_interior_closed_form_matches_slsqp(self, interior_mu_cov):
+        mu, cov = interior_mu_cov
+        w = max_sharpe(mu, cov, n_assets=3, risk_free=0.02).weights
+        ref = _slsqp(
+            lambda w: -portfolio_stats(w, mu, cov, risk_free=0.02)[2], 3
+        )
+        np.testing.assert_allclose(w, ref, atol=1e-4)
+
+    def test_single_positive_asset_with_binding_cap(self):
+        mu = np.array([0.10, -0.02, -0.03]) / 252
+        cov = np.diag([0.10, 0.12, 0.15]) ** 2 / 252
+        for lam in (0.0, 0.01):
+            r = max_sharpe(
+                mu, cov, n_assets=3, max_weight=0.4, risk_free=0.0,
+                turnover_penalty=lam,
+            )
+            assert abs(r.weights.sum() - 1.0) < 1e-8
+            assert np.all(r.weights <= 0.4 + 1e-8)
+            assert abs(r.weights[0] - 0.4) < 1e-4
+
+    def test_no_positive_excess_return_still_feasible(self, mu_cov):
+        mu, cov = mu_cov
+        w = max_sharpe(mu, cov, n_assets=3, risk_free=10.0).weights
+        assert abs(w.sum() - 1.0) < 1e-8
+        assert np.all(w >= -1e-8)
+
 
 class TestMinVariance:
     def test_returns_optim_result(self, mu_cov):
@@ -99,6 +163,12 @@ class TestMinVariance:
         assert np.all(w >= -1e-8)
         assert np.all(w <= 0.5 + 1e-8)
 
+    def test_interior_closed_form_matches_slsqp(self, interior_mu_cov):
+        mu, cov = interior_mu_cov
+        w = min_variance(mu, cov, n_assets=3).weights
+        ref = _slsqp(lambda w: w @ cov @ w * 1e4, 3)
+        np.testing.assert_allclose(w, ref, atol=1e-4)
+
     def test_lower_volatility_than_max_sharpe(self, mu_cov):
         mu, cov = mu_cov
         vol_mv = min_variance(mu, cov, n_assets=3).vol
@@ -113,6 +183,14 @@ class TestEfficientFrontier:
         assert len(f_vols) > 5
         assert np.all(np.diff(f_vols) >= -1e-6)
 
+    def test_reuses_given_min_variance(self, mu_cov):
+        mu, cov = mu_cov
+        mv = min_variance(mu, cov, n_assets=3)
+        f_vols, _ = efficient_frontier(
+            mu, cov, n_assets=3, n_points=10, min_var=mv
+        )
+        assert abs(f_vols[0] - mv.vol) < 1e-6
+
 
 class TestRiskContributions:
     def test_sums_to_one(self, mu_cov):